@@ -68,7 +68,7 @@ class ANSICodeStyle:
         if self.owner.last is not None:
             with self.owner.last:
                 pass
-        self.owner.write("".join(text))
+        self.owner.write(text)
         self.owner.last = self
         self.postfix = postfix
         
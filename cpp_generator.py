@@ -156,13 +156,17 @@ class CppLanguageElement(object):
         Supports for nested classes, e.g.
         void MyClass::NestedClass::Method()
         '''
-        full_qualified_name = ''
         parent = self.ref_to_parent
+        if not parent:
+            return ''
+        parent_names = []
         # walk though all existing parents
         while parent:
-            full_qualified_name = '{0}::{1}'.format(parent.name, full_qualified_name)
+            parent_names.append(parent.name)
             parent = parent.ref_to_parent
-        return full_qualified_name
+        # outermost class goes first, every name is followed by '::'
+        parent_names.reverse()
+        return '::'.join(parent_names) + '::'
 
 
 class CppFunction(CppLanguageElement):
@@ -236,6 +240,12 @@ class CppFunction(CppLanguageElement):
         '''
         self.arguments.append(argument)
 
+    def add_arguments(self, arguments):
+        '''
+        @param: arguments - list of strings, C++ function arguments ('int a', 'void p = NULL' etc)
+        '''
+        self.arguments.extend(arguments)
+
     def implementation(self, cpp):
         '''
         The method calls Python function that creates C++ method body if handle exists
@@ -329,7 +339,7 @@ class CppFunction(CppLanguageElement):
         with cpp.block('{0}{1} {2}{3}({4}){5}{6}'.format(
                 '/*virtual*/' if self.is_virtual else '',
                 self.ret_type if self.ret_type else '',
-                '{0}'.format(self.parent_qualifier()) if self.is_method else '',
+                self.parent_qualifier() if self.is_method else '',
                 self.name,
                 ', '.join(self.arguments),
                 ' const ' if self.is_const else '',
@@ -517,7 +527,7 @@ class CppVariable(CppLanguageElement):
         if self.is_static:
             cpp('{0}{1} {2}{3} {4};'.format('const ' if self.is_const else '',
                                             self.type,
-                                            '{0}'.format(self.parent_qualifier()),
+                                            self.parent_qualifier(),
                                             self.name,
                                             ' = {0}'.format(
                                                 self.initialization_value if self.initialization_value else'')))
@@ -603,7 +613,7 @@ class CppArray(CppLanguageElement):
             raise RuntimeError('Empty arrays do not supported')
         for item in self.items[:-1]:
             cpp('{0},'.format(item))
-        cpp('{0}'.format(self.items[-1]))
+        cpp(self.items[-1])
 
     def render_to_string(self, cpp):
         '''
@@ -680,7 +690,7 @@ class CppArray(CppLanguageElement):
             with cpp.block('{0}{1}{2} {3}{4}{5} = '.format('static ' if self.is_static else '',
                                                            'const ' if self.is_const else '',
                                                            self.type,
-                                                           '{0}'.format(self.parent_qualifier()),
+                                                           self.parent_qualifier(),
                                                            self.name,
                                                            '[{0}]'.format(self.arraySize if self.arraySize else'')),
                            ';'):
@@ -690,7 +700,7 @@ class CppArray(CppLanguageElement):
             cpp('{0}{1}{2} {3}{4}{5} = {6};'.format('static ' if self.is_static else '',
                                                     'const ' if self.is_const else '',
                                                     self.type,
-                                                    '{0}'.format(self.parent_qualifier()),
+                                                    self.parent_qualifier(),
                                                     self.name,
                                                     '[{0}]'.format(self.arraySize if self.arraySize else''),
                                                     '{{{0}}}'.format(', '.join(self.items)) if self.items else 'NULL'))
@@ -2,8 +2,10 @@ import unittest
 import filecmp
 import os
 import io
+import pickle
+import shutil
+import tempfile
 
-from textwrap import dedent
 from code_generator import *
 from cpp_generator import *
 
@@ -12,71 +14,72 @@ __doc__ = '''
 Unit tests for C++ code generator
 '''
 
+# Expected output written out already dedented
+_EXPECTED_FACTORIAL = ('constexpr int factorial(int n)\n'
+                       '{\n'
+                       '\treturn n < 1 ? 1 : (n * factorial(n - 1));\n'
+                       '}')
+
+_EXPECTED_FACTORIAL_DOCUMENTED = ('/// Calculates and returns the factorial of \\p n.\n' +
+                                  _EXPECTED_FACTORIAL)
+
 def handle_to_factorial(self, cpp):
     cpp('return n < 1 ? 1 : (n * factorial(n - 1));')
 
 class TestCppFunctionGenerator(unittest.TestCase):
 
+    def setUp(self):
+        self.writer = io.StringIO()
+        self.cpp = CppFile(None, writer=self.writer)
+
     def handle_to_factorial(self, cpp):
         cpp('return n < 1 ? 1 : (n * factorial(n - 1));')
 
     def test_is_constexpr_raises_error_when_implementation_value_is_none(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         func = CppFunction(name="factorial", ret_type="int", is_constexpr=True)
-        self.assertRaises(RuntimeError, func.render_to_string, cpp)
+        self.assertRaises(RuntimeError, func.render_to_string, self.cpp)
 
     def test_is_constexpr_render_to_string(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         func = CppFunction(name="factorial", ret_type="int", implementation_handle=TestCppFunctionGenerator.handle_to_factorial, is_constexpr=True)
         func.add_argument('int n')
-        func.render_to_string(cpp)
-        self.assertIn(dedent('''\
-            constexpr int factorial(int n)
-            {
-            \treturn n < 1 ? 1 : (n * factorial(n - 1));
-            }'''), writer.getvalue())
+        func.render_to_string(self.cpp)
+        self.assertIn(_EXPECTED_FACTORIAL, self.writer.getvalue())
 
     def test_is_constexpr_render_to_string_declaration(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         func = CppFunction(name="factorial", ret_type="int", implementation_handle=TestCppFunctionGenerator.handle_to_factorial, is_constexpr=True)
         func.add_argument('int n')
-        func.render_to_string_declaration(cpp)
-        self.assertIn(dedent('''\
-            constexpr int factorial(int n)
-            {
-            \treturn n < 1 ? 1 : (n * factorial(n - 1));
-            }'''), writer.getvalue())
+        func.render_to_string_declaration(self.cpp)
+        self.assertIn(_EXPECTED_FACTORIAL, self.writer.getvalue())
+
+    def test_add_arguments_render_to_string_declaration(self):
+        func = CppFunction(name="Resize", ret_type="void")
+        func.add_arguments(['size_t width', 'size_t height'])
+        func.add_argument('bool keep_ratio = true')
+        func.render_to_string_declaration(self.cpp)
+        self.assertEqual('void Resize(size_t width, size_t height, bool keep_ratio = true);\n', self.writer.getvalue())
 
     def test_README_example(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         factorial_function = CppFunction(name='factorial', ret_type='int', is_constexpr=True, implementation_handle=handle_to_factorial, documentation='/// Calculates and returns the factorial of \p n.')
         factorial_function.add_argument('int n')
-        factorial_function.render_to_string(cpp)
-        self.assertIn(dedent('''\
-            /// Calculates and returns the factorial of \p n.
-            constexpr int factorial(int n)
-            {
-            \treturn n < 1 ? 1 : (n * factorial(n - 1));
-            }'''), writer.getvalue())
+        factorial_function.render_to_string(self.cpp)
+        self.assertIn(_EXPECTED_FACTORIAL_DOCUMENTED, self.writer.getvalue())
 
 
 class TestCppVariableGenerator(unittest.TestCase):
 
+    def setUp(self):
+        self.writer = io.StringIO()
+        self.cpp = CppFile(None, writer=self.writer)
+
     def test_cpp_var_via_writer(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         variables = CppVariable(name="var1",
                                 type="char*",
                                 is_class_member=False,
                                 is_static=False,
                                 is_const=True,
                                 initialization_value='0')
-        variables.render_to_string(cpp)
-        self.assertEqual('const char* var1 = 0;\n', writer.getvalue())
+        variables.render_to_string(self.cpp)
+        self.assertEqual('const char* var1 = 0;\n', self.writer.getvalue())
 
     def test_is_constexpr_raises_error_when_is_const_true(self):
         self.assertRaises(RuntimeError, CppVariable, name="COUNT", type="int", is_class_member=True, is_const=True, is_constexpr=True, initialization_value='0')
@@ -85,36 +88,40 @@ class TestCppVariableGenerator(unittest.TestCase):
         self.assertRaises(RuntimeError, CppVariable, name="COUNT", type="int", is_class_member=True, is_constexpr=True)
 
     def test_is_constexpr_render_to_string(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         variables = CppVariable(name="COUNT",
                                 type="int",
                                 is_class_member=False,
                                 is_constexpr=True,
                                 initialization_value='0')
-        variables.render_to_string(cpp)
-        self.assertIn('constexpr int COUNT = 0;', writer.getvalue())
+        variables.render_to_string(self.cpp)
+        self.assertIn('constexpr int COUNT = 0;', self.writer.getvalue())
 
     def test_is_constexpr_render_to_string_declaration(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         variables = CppVariable(name="COUNT",
                                 type="int",
                                 is_class_member=True,
                                 is_constexpr=True,
                                 initialization_value='0')
-        variables.render_to_string_declaration(cpp)
-        self.assertIn('constexpr int COUNT = 0;', writer.getvalue())
+        variables.render_to_string_declaration(self.cpp)
+        self.assertIn('constexpr int COUNT = 0;', self.writer.getvalue())
 
     def test_is_extern_raises_error_when_is_static_is_true(self):
         self.assertRaises(RuntimeError, CppVariable, name="var1", type="char*", is_static=True, is_extern=True)
 
     def test_is_extern_render_to_string(self):
-        writer = io.StringIO()
-        cpp = CppFile(None, writer=writer)
         v = CppVariable(name="var1", type="char*", is_extern=True)
-        v.render_to_string(cpp)
-        self.assertIn('extern char* var1;', writer.getvalue())
+        v.render_to_string(self.cpp)
+        self.assertIn('extern char* var1;', self.writer.getvalue())
+
+    def test_pickle_round_trip(self):
+        v = CppVariable(name="var1", type="char*", is_const=True, initialization_value='0')
+        v.custom_tag = 'user data'
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            restored = pickle.loads(pickle.dumps(v, protocol))
+            self.assertEqual('user data', restored.custom_tag)
+            writer = io.StringIO()
+            restored.render_to_string(CppFile(None, writer=writer))
+            self.assertEqual('const char* var1 = 0;\n', writer.getvalue())
 
 
 class TestCppGenerator(unittest.TestCase):
@@ -122,41 +129,42 @@ class TestCppGenerator(unittest.TestCase):
     Test C++ code generation
     '''
 
+    def setUp(self):
+        # every test generates into its own directory, so tests share no files
+        # and could run in parallel (see README, python -m pytest -n auto)
+        self.output_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.output_dir)
+
     def test_cpp_variables(self):
-        generate_var(output_dir='.')
+        generate_var(output_dir=self.output_dir)
         expected_cpp = ['var.cpp']
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_cpp)[0], expected_cpp)
-        os.remove(expected_cpp[0])
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_cpp)[0], expected_cpp)
 
     def test_cpp_arrays(self):
-        generate_array(output_dir='.')
+        generate_array(output_dir=self.output_dir)
         expected_cpp = ['array.cpp']
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_cpp)[0], expected_cpp)
-        os.remove(expected_cpp[0])
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_cpp)[0], expected_cpp)
 
     def test_cpp_function(self):
-        generate_func(output_dir='.')
+        generate_func(output_dir=self.output_dir)
         expected_cpp = ['func.cpp']
         expected_h = ['func.h']
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_cpp)[0], expected_cpp)
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_h)[0], expected_h)
-        os.remove(expected_cpp[0])
-        os.remove(expected_h[0])
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_cpp)[0], expected_cpp)
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_h)[0], expected_h)
 
     def test_cpp_enum(self):
-        generate_enum(output_dir='.')
+        generate_enum(output_dir=self.output_dir)
         expected_cpp = ['enum.cpp']
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_cpp)[0], expected_cpp)
-        os.remove(expected_cpp[0])
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_cpp)[0], expected_cpp)
 
     def test_cpp_class(self):
-        generate_class(output_dir='.')
+        generate_class(output_dir=self.output_dir)
         expected_cpp = ['class.cpp']
         expected_h = ['class.h']
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_cpp)[0], expected_cpp)
-        self.assertEqual(filecmp.cmpfiles('.', 'tests', expected_h)[0], expected_h)
-        os.remove(expected_cpp[0])
-        os.remove(expected_h[0])
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_cpp)[0], expected_cpp)
+        self.assertEqual(filecmp.cmpfiles(self.output_dir, 'tests', expected_h)[0], expected_h)
 
 
 # Generate test data